@@ -0,0 +1,173 @@
+"""
+Submit timesheets for many Procas accounts at once.
+
+The accounts manifest is a JSON file like:
+
+    {
+        "max_workers": 4,
+        "accounts": [
+            {
+                "name": "alice",
+                "email": "alice@example.com",
+                "password_env": "ALICE_PROCAS_PASSWORD",
+                "hours_csv": "hours/alice.csv"
+            }
+        ]
+    }
+
+Each account needs either "password" or "password_env" (the name of an
+environment variable, which may also come from .env). "hours_csv" uses the
+same date,category,hours format as timesheet_data.csv; relative paths are
+resolved against the manifest's directory.
+
+Usage: python batch_runner.py accounts.json [--period 2025-01-16] [--workers 4]
+"""
+import argparse
+import csv
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from dotenv import load_dotenv
+
+from procas_automation import ProcasTimesheet
+from submission_queue import period_for
+
+
+def load_manifest(path):
+    """Reads the accounts manifest, resolving passwords and hours file paths."""
+    load_dotenv()
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    base_dir = os.path.dirname(os.path.abspath(path))
+    accounts = []
+    for account in manifest.get('accounts', []):
+        name = account.get('name') or account.get('email')
+        password = account.get('password')
+        if not password and account.get('password_env'):
+            password = os.environ.get(account['password_env'])
+        if not account.get('email') or not password or not account.get('hours_csv'):
+            raise ValueError(f"Account '{name}' needs email, password/password_env and hours_csv.")
+
+        accounts.append({
+            'name': name,
+            'email': account['email'],
+            'password': password,
+            'hours_csv': os.path.join(base_dir, account['hours_csv']),
+        })
+
+    return accounts, manifest.get('max_workers', 4)
+
+
+def load_hours(csv_path, period):
+    """Returns [(date_str, category, hours)] with non-zero hours inside 'period'."""
+    entries = []
+    with open(csv_path, 'r', newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            date_str = row.get('date', '')
+            category = row.get('category', '')
+            if not date_str or not category or period_for(date_str) != period:
+                continue
+
+            try:
+                hours = float(row.get('hours', '0'))
+            except ValueError:
+                continue
+
+            if hours > 0:
+                entries.append((date_str, category, hours))
+
+    return entries
+
+
+def run_account(account, period):
+    """Submits one account's hours in its own browser profile and returns a result dict."""
+    result = {'name': account['name'], 'submitted': 0, 'failed': [], 'error': None}
+    start = time.monotonic()
+    profile_dir = None
+    procas = None
+
+    try:
+        # Names like "team/alice" would otherwise point the prefix at a directory
+        safe_name = re.sub(r'[^\w.-]', '_', account['name'])
+        profile_dir = tempfile.mkdtemp(prefix=f"procas-{safe_name}-")
+        entries = load_hours(account['hours_csv'], period)
+        procas = ProcasTimesheet(account['email'], account['password'], profile_dir=profile_dir)
+        procas.login()
+
+        for date_str, category, hours in entries:
+            procas.checkpoint()
+            procas.driver.get(procas.base_url)
+            procas.open_timesheet()
+            if procas.submit_hours(category, hours, date_str):
+                result['submitted'] += 1
+            else:
+                result['failed'].append(f"{category} on {date_str}")
+
+    except Exception as e:
+        result['error'] = str(e)
+
+    finally:
+        if procas:
+            procas.cleanup()
+        if profile_dir:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        result['seconds'] = time.monotonic() - start
+
+    return result
+
+
+def run_batch(accounts, period, max_workers=4):
+    """Runs every account on a bounded worker pool, returning results as they finish."""
+    results = []
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [pool.submit(run_account, account, period) for account in accounts]
+        for future in as_completed(futures):
+            result = future.result()
+            status = "OK" if not result['error'] and not result['failed'] else "FAILED"
+            print(f"[{status}] {result['name']} ({result['seconds']:.1f}s)")
+            results.append(result)
+
+    return results
+
+
+def print_report(results, elapsed):
+    print("\n=== Batch Summary ===")
+    for result in sorted(results, key=lambda r: r['name']):
+        print(f"{result['name']}: {result['submitted']} submitted, "
+              f"{len(result['failed'])} failed, {result['seconds']:.1f}s")
+        if result['error']:
+            print(f"  error: {result['error']}")
+        for failure in result['failed']:
+            print(f"  failed: {failure}")
+    print(f"Total: {len(results)} accounts in {elapsed:.1f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Submit Procas timesheets for many accounts.")
+    parser.add_argument('manifest', help="Path to the accounts manifest (JSON)")
+    parser.add_argument('--period', default=period_for(datetime.today().strftime("%Y-%m-%d")),
+                        help="Any date in the timesheet period to submit (default: current period)")
+    parser.add_argument('--workers', type=int, help="Override max_workers from the manifest")
+    args = parser.parse_args()
+
+    accounts, max_workers = load_manifest(args.manifest)
+    # Any date inside the period works; normalize it to the period key
+    period = period_for(args.period)
+    start = time.monotonic()
+    results = run_batch(accounts, period, args.workers or max_workers)
+    print_report(results, time.monotonic() - start)
+
+    if any(r['error'] or r['failed'] for r in results):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import atexit
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+try:
+    import psutil  # pip install psutil (optional; enables memory watermarks and orphan cleanup)
+except ImportError:
+    psutil = None
+
+# Every chromedriver/Chrome process any manager has seen, so they can be reaped at exit
+_launched_processes = set()
+# Whether the missing-psutil warning has been printed yet (once per process)
+_warned_no_psutil = False
+
+
+def _kill_processes(processes):
+    alive = []
+    for proc in processes:
+        try:
+            if proc.is_running():
+                proc.kill()
+                alive.append(proc)
+        except psutil.Error:
+            pass
+    if alive:
+        psutil.wait_procs(alive, timeout=3)
+
+
+@atexit.register
+def kill_orphaned_browsers():
+    """Kill any chromedriver/Chrome process we launched that is still running."""
+    if psutil is None:
+        return
+    _kill_processes(list(_launched_processes))
+    _launched_processes.clear()
+
+
+class DriverManager:
+    """
+    Owns the Chrome driver: counts operations, watches the RSS of the
+    chromedriver/Chrome process tree and tells the caller when the browser
+    should be recycled.
+    """
+
+    def __init__(self, max_rss_mb=1500, max_operations=150, headless=True, profile_dir=None):
+        self.max_rss_mb = max_rss_mb
+        self.max_operations = max_operations
+        self.headless = headless
+        self.profile_dir = profile_dir
+
+        self.driver = None
+        self.operations = 0
+
+        global _warned_no_psutil
+        if psutil is None and not _warned_no_psutil:
+            _warned_no_psutil = True
+            print("psutil is not installed: browser memory limits and orphan cleanup at exit "
+                  "are disabled (pip install psutil)")
+
+    def start(self):
+        """Launch a fresh browser and return its driver."""
+        options = webdriver.ChromeOptions()
+        if self.headless:
+            options.add_argument('--headless')
+        if self.profile_dir:
+            options.add_argument(f'--user-data-dir={self.profile_dir}')
+
+        self.driver = webdriver.Chrome(options=options)
+        self.operations = 0
+        self.process_tree()
+        return self.driver
+
+    def process_tree(self):
+        """
+        Returns psutil.Process objects for chromedriver and every Chrome process
+        under it (empty without psutil). Also records them for cleanup at exit.
+        """
+        if psutil is None or self.driver is None:
+            return []
+
+        try:
+            root = psutil.Process(self.driver.service.process.pid)
+            tree = [root] + root.children(recursive=True)
+        except (AttributeError, psutil.Error):
+            return []
+
+        _launched_processes.update(tree)
+        return tree
+
+    def rss_mb(self):
+        """Total resident memory of the browser process tree, in MB."""
+        total = 0
+        for proc in self.process_tree():
+            try:
+                total += proc.memory_info().rss
+            except psutil.Error:
+                pass
+        return total / (1024 * 1024)
+
+    def record_operation(self):
+        self.operations += 1
+
+    def recycle_reason(self):
+        """
+        Returns why the browser should be recycled ('operations', 'memory' or
+        'unresponsive'), or None if it is fine to keep using.
+        """
+        if self.driver is None:
+            return None
+
+        if self.operations >= self.max_operations:
+            return 'operations'
+
+        if psutil is not None and self.rss_mb() >= self.max_rss_mb:
+            return 'memory'
+
+        try:
+            self.driver.execute_script("return 1")
+        except WebDriverException:
+            return 'unresponsive'
+
+        return None
+
+    def quit(self):
+        """Close the browser, killing anything in its tree that doesn't exit on its own."""
+        if not self.driver:
+            return
+
+        tree = self.process_tree()
+        try:
+            self.driver.quit()
+        except WebDriverException as e:
+            print(f"Error closing browser: {str(e)}")
+        self.driver = None
+
+        if tree:
+            _kill_processes(tree)
+            _launched_processes.difference_update(tree)
@@ -1,33 +1,50 @@
 import os
-from dotenv import load_dotenv
-from selenium import webdriver
+from dotenv import load_dotenv  # pip install python-dotenv
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException
+from selenium.common.exceptions import TimeoutException, WebDriverException
 import time
+from datetime import datetime
+
+from driver_manager import DriverManager  # pip install psutil for memory limits and orphan cleanup
 
 class ProcasTimesheet:
-    def __init__(self):
+    def __init__(self, email=None, password=None, profile_dir=None):
         # 1) Load environment variables from .env
         load_dotenv()
 
-        # 2) Retrieve credentials from environment
-        self.email = os.environ.get("PROCAS_EMAIL")
-        self.password = os.environ.get("PROCAS_PASSWORD")
+        # 2) Use explicit credentials if given, otherwise fall back to the environment
+        self.email = email or os.environ.get("PROCAS_EMAIL")
+        self.password = password or os.environ.get("PROCAS_PASSWORD")
 
         if not self.email or not self.password:
             raise ValueError("Missing PROCAS_EMAIL or PROCAS_PASSWORD in environment variables.")
 
         self.driver = None
+        # profile_dir gives this instance its own Chrome profile (needed when running several at once)
+        self.driver_manager = DriverManager(profile_dir=profile_dir)
         self.base_url = "https://accounting.procas.com"
 
     def setup_driver(self):
         if not self.driver:
-            options = webdriver.ChromeOptions()
-            options.add_argument('--headless')
-            # or other driver settings
-            self.driver = webdriver.Chrome(options=options)
+            self.driver = self.driver_manager.start()
+
+    def checkpoint(self):
+        """
+        Counts one operation against the current browser. If it has crossed its
+        memory or operation limit (or stopped responding), restart it and log
+        back in. Call between operations, never in the middle of one.
+        """
+        if not self.driver:
+            return
+
+        self.driver_manager.record_operation()
+        reason = self.driver_manager.recycle_reason()
+        if reason:
+            print(f"Recycling browser ({reason}) after {self.driver_manager.operations} operations")
+            self.cleanup()
+            self.login()
 
     def login(self):
         self.setup_driver()
@@ -62,13 +79,7 @@ class ProcasTimesheet:
         Retrieves a list of categories from the currently open timesheet.
         """
         self.login()
-        
-        # Navigate to "Edit an Open Timesheet"
-        edit_link = WebDriverWait(self.driver, 10).until(
-            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Edit an Open Timesheet')]"))
-        )
-        edit_link.click()
-        time.sleep(2)
+        self.open_timesheet()
         
         # Example: each charge row has <tr class="time_timecardtable">
         # with a category name in <td class="time_timecardtableItem">
@@ -86,12 +97,24 @@ class ProcasTimesheet:
         
         return categories
 
+    def open_timesheet(self):
+        """Navigates from the home page to the currently open timesheet."""
+        edit_link = WebDriverWait(self.driver, 10).until(
+            EC.element_to_be_clickable((By.XPATH, "//a[contains(text(), 'Edit an Open Timesheet')]"))
+        )
+        edit_link.click()
+        time.sleep(2)
+
     def submit_hours(self, category, hours, date_str):
         """
         Submits (or edits) 'hours' for 'category' on the *currently open timesheet* 
         for date 'date_str' (YYYY-MM-DD). If there's already a numeric value in that cell:
           - If it matches 'hours', we do NOTHING (skip).
           - Otherwise, we go through the "edit reason" flow.
+        Returns True if the cell now holds 'hours', False if Procas refused it (the
+        category or date isn't on the open timesheet, or the entry failed).
+        Timeouts and other WebDriver errors are raised: they mean Procas is slow
+        or down, not that the entry is bad.
         """
         if not self.driver:
             self.login()
@@ -105,15 +128,27 @@ class ProcasTimesheet:
             row_xpath = (
                 "//tr[@class='time_timecardtable'][td[@class='time_timecardtableItem']/a[text()='{cat}']]"
             ).format(cat=category)
-            row_element = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.XPATH, row_xpath))
-            )
+            try:
+                row_element = WebDriverWait(self.driver, 10).until(
+                    EC.presence_of_element_located((By.XPATH, row_xpath))
+                )
+            except TimeoutException:
+                # The timesheet rendered without this row: the category is gone
+                if self.driver.find_elements(By.CLASS_NAME, "time_timecardtable"):
+                    print(f"Category {category} is not on the open timesheet")
+                    return False
+                raise
             
             # 3) Within that row, find the <a> link containing "entrydate=1/31/2025", e.g.
             cell_link_xpath = f".//a[contains(@href, 'entrydate={link_date}')]"
-            cell_link_element = WebDriverWait(row_element, 10).until(
-                EC.presence_of_element_located((By.XPATH, cell_link_xpath))
-            )
+            try:
+                cell_link_element = WebDriverWait(row_element, 10).until(
+                    EC.presence_of_element_located((By.XPATH, cell_link_xpath))
+                )
+            except TimeoutException:
+                # The row is there but the date isn't: it's outside the open period
+                print(f"{date_str} is not on the open timesheet")
+                return False
             
             cell_text = cell_link_element.text.strip()  # e.g. "" or "8"
 
@@ -129,12 +164,15 @@ class ProcasTimesheet:
                 old_hrs_float = float(cell_text)
 
             # 5) Decide whether to skip, edit, or add
+            if not already_has_value and new_hrs_float == 0:
+                # Nothing to clear in a blank cell
+                return True
             if already_has_value:
                 # There's an existing numeric value in the cell
                 if abs(old_hrs_float - new_hrs_float) < 0.000001:
                     # The new value == old value -> skip entirely
                     print(f"Hours match existing value ({old_hrs_float}). Skipping edit.")
-                    return
+                    return True
                 else:
                     # Edit existing entry
                     self.edit_existing_hours(cell_link_element, old_hrs_float, new_hrs_float)
@@ -142,8 +180,13 @@ class ProcasTimesheet:
                 # No existing numeric value -> add new
                 self.add_new_hours(cell_link_element, new_hrs_float)
 
+            return True
+
+        except WebDriverException:
+            raise
         except Exception as e:
             print(f"Error submitting hours for {category} on {date_str}: {str(e)}")
+            return False
 
     def add_new_hours(self, cell_link_element, new_hrs_float):
         """
@@ -277,6 +320,5 @@ class ProcasTimesheet:
 
     def cleanup(self):
         """Close the browser when done."""
-        if self.driver:
-            self.driver.quit()
-            self.driver = None
+        self.driver_manager.quit()
+        self.driver = None
@@ -0,0 +1,237 @@
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from procas_automation import ProcasTimesheet
+
+
+def period_for(date_str):
+    """
+    Returns the key of the semi-monthly timesheet period containing 'date_str'
+    (YYYY-MM-DD): the date of the 1st or the 16th of that month.
+    """
+    dt_obj = datetime.strptime(date_str, "%Y-%m-%d")
+    return dt_obj.replace(day=1 if dt_obj.day <= 15 else 16).strftime("%Y-%m-%d")
+
+
+class SubmissionOutbox:
+    """
+    Durable local queue of hour submissions that haven't reached Procas yet.
+
+    Entries are keyed by (period, category, date); queuing the same cell again
+    overwrites the pending value, so repeated edits collapse into one remote write.
+    An entry Procas rejects 'max_attempts' times is parked in the 'failed' state
+    instead of being retried forever; queuing the cell again makes it pending.
+    """
+
+    def __init__(self, path='submission_outbox.db', max_attempts=5):
+        self.path = path
+        self.max_attempts = max_attempts
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS outbox (
+                    period TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    date TEXT NOT NULL,
+                    hours REAL NOT NULL,
+                    queued_at REAL NOT NULL,
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    state TEXT NOT NULL DEFAULT 'pending',
+                    PRIMARY KEY (period, category, date)
+                )
+                """
+            )
+
+    def enqueue(self, category, hours, date_str):
+        """Queue 'hours' for 'category' on 'date_str', replacing any pending value."""
+        with self.lock, self.conn:
+            self.conn.execute(
+                """
+                INSERT INTO outbox (period, category, date, hours, queued_at, attempts, state)
+                VALUES (?, ?, ?, ?, ?, 0, 'pending')
+                ON CONFLICT (period, category, date) DO UPDATE SET
+                    hours = excluded.hours,
+                    queued_at = excluded.queued_at,
+                    attempts = 0,
+                    state = 'pending'
+                """,
+                (period_for(date_str), category, date_str, float(hours), time.time()),
+            )
+
+    def pending(self, limit=None):
+        """Returns queued entries as dicts, least-retried and oldest first."""
+        return self._entries('pending', limit)
+
+    def failed(self):
+        """Returns entries that gave up after max_attempts rejections."""
+        return self._entries('failed')
+
+    def _entries(self, state, limit=None):
+        query = (
+            "SELECT period, category, date, hours, queued_at, attempts FROM outbox "
+            "WHERE state = ? ORDER BY attempts, period, date, category"
+        )
+        params = (state,)
+        if limit is not None:
+            query += " LIMIT ?"
+            params += (limit,)
+
+        with self.lock:
+            rows = self.conn.execute(query, params).fetchall()
+
+        keys = ('period', 'category', 'date', 'hours', 'queued_at', 'attempts')
+        return [dict(zip(keys, row)) for row in rows]
+
+    def remove(self, entry):
+        """
+        Drops a flushed entry. If the cell was re-queued while the entry was in
+        flight, the newer value is kept so it gets flushed too.
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM outbox WHERE period = ? AND category = ? AND date = ? AND queued_at = ?",
+                (entry['period'], entry['category'], entry['date'], entry['queued_at']),
+            )
+
+    def mark_failed(self, entry):
+        """
+        Bumps the attempt counter so failing entries don't starve the rest, and
+        moves the entry to the 'failed' state once it reaches max_attempts.
+        """
+        with self.lock, self.conn:
+            self.conn.execute(
+                "UPDATE outbox SET attempts = attempts + 1, "
+                "state = CASE WHEN attempts + 1 >= ? THEN 'failed' ELSE state END "
+                "WHERE period = ? AND category = ? AND date = ? AND queued_at = ?",
+                (self.max_attempts, entry['period'], entry['category'], entry['date'], entry['queued_at']),
+            )
+
+    def failed_count(self):
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state = 'failed'"
+            ).fetchone()[0]
+
+    def __len__(self):
+        """Number of pending entries; failed ones wait for the user to re-queue them."""
+        with self.lock:
+            return self.conn.execute(
+                "SELECT COUNT(*) FROM outbox WHERE state = 'pending'"
+            ).fetchone()[0]
+
+
+class OutboxFlusher:
+    """
+    Background thread that drains a SubmissionOutbox into Procas in batches,
+    one login per batch, backing off exponentially while Procas is unreachable.
+    Entries Procas answers but rejects are retried without the long backoff
+    until the outbox parks them as failed.
+    """
+
+    def __init__(self, outbox, batch_size=25, min_backoff=5, max_backoff=600, on_status=None):
+        self.outbox = outbox
+        self.batch_size = batch_size
+        self.min_backoff = min_backoff
+        self.max_backoff = max_backoff
+        # Called with a short human-readable message from the flusher thread
+        self.on_status = on_status
+
+        self.wake_event = threading.Event()
+        self.stop_event = threading.Event()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def wake(self):
+        """Ask the flusher to look at the outbox now (e.g. right after queuing)."""
+        self.wake_event.set()
+
+    def stop(self):
+        self.stop_event.set()
+        self.wake_event.set()
+
+    def _report(self, message):
+        print(message)
+        if self.on_status:
+            self.on_status(message)
+
+    def _run(self):
+        backoff = self.min_backoff
+        while not self.stop_event.is_set():
+            if not len(self.outbox):
+                self.wake_event.wait()
+                self.wake_event.clear()
+                continue
+
+            try:
+                flushed, rejected = self.flush_batch()
+            except Exception as e:
+                # Login, connection or timeout failure: Procas never got to answer,
+                # so nothing left in the batch counts as an attempt
+                print(f"Error flushing submission outbox: {str(e)}")
+                self._report(f"Procas unreachable, {len(self.outbox)} queued. Retrying in {backoff}s")
+                self.stop_event.wait(backoff)
+                backoff = min(backoff * 2, self.max_backoff)
+                continue
+
+            backoff = self.min_backoff
+            if rejected and not flushed:
+                # Procas is up but refused the whole batch; pause briefly before retrying
+                self.stop_event.wait(self.min_backoff)
+
+    def flush_batch(self):
+        """
+        Submits up to batch_size queued entries in one session. Returns
+        (flushed, rejected). Only entries Procas actually refused count as
+        rejected. Login, connection and timeout errors are raised, which stops
+        the batch and leaves the remaining entries' attempt counts untouched.
+        """
+        batch = self.outbox.pending(self.batch_size)
+        if not batch:
+            return 0, 0
+
+        flushed = rejected = 0
+        procas = ProcasTimesheet()
+        try:
+            procas.login()
+            for i, entry in enumerate(batch, start=1):
+                if self.stop_event.is_set():
+                    break
+                self._report(f"Syncing {i}/{len(batch)}...")
+
+                procas.checkpoint()
+                procas.driver.get(procas.base_url)
+                procas.open_timesheet()
+                if procas.submit_hours(entry['category'], entry['hours'], entry['date']):
+                    self.outbox.remove(entry)
+                    flushed += 1
+                else:
+                    self.outbox.mark_failed(entry)
+                    rejected += 1
+        finally:
+            procas.cleanup()
+
+        summary = self.summary(flushed, rejected)
+        if summary:
+            self._report(summary)
+        return flushed, rejected
+
+    def summary(self, flushed=0, rejected=0):
+        """Status line for the last batch plus what is still queued or failed."""
+        parts = []
+        if flushed:
+            parts.append(f"Synced {flushed} entries")
+        if rejected:
+            parts.append(f"Procas rejected {rejected} entries")
+        remaining = len(self.outbox)
+        if remaining:
+            parts.append(f"{remaining} queued")
+        failed = self.outbox.failed_count()
+        if failed:
+            parts.append(f"{failed} failed after {self.outbox.max_attempts} attempts")
+        return ", ".join(parts)
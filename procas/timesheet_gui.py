@@ -6,7 +6,9 @@ from datetime import datetime, timedelta
 from threading import Thread
 
 import sv_ttk  # pip install sv_ttk for the Sun Valley theme
+# Also needs: pip install selenium python-dotenv psutil (psutil enables browser memory limits)
 from procas_automation import ProcasTimesheet  # Your Selenium automation (headless)
+from submission_queue import SubmissionOutbox, OutboxFlusher
 
 class TimesheetApp:
     def __init__(self, root):
@@ -30,9 +32,17 @@ class TimesheetApp:
         # Build the UI
         self.create_top_frame()
         self.create_entries_frame()
-        self.create_progress_bar()
         self.create_bottom_frame()
 
+        # Submissions go to a local outbox; the flusher syncs them to Procas in the background
+        self.outbox = SubmissionOutbox()
+        self.flusher = OutboxFlusher(self.outbox, on_status=self.set_status)
+        self.flusher.start()
+        # Entries left over from earlier sessions, including any Procas gave up on
+        summary = self.flusher.summary()
+        if summary:
+            self.status_label.config(text=summary)
+
         # Load data from CSV
         self.load_from_csv()
         self.create_hour_entries()
@@ -76,10 +86,6 @@ class TimesheetApp:
         self.entries_frame = ttk.Frame(self.root, padding=10)
         self.entries_frame.pack(fill=tk.BOTH, expand=True)
 
-    def create_progress_bar(self):
-        """Progress bar at bottom, hidden by default."""
-        self.progress = ttk.Progressbar(self.root, length=280, mode='determinate')
-
     def create_bottom_frame(self):
         """Bottom area: Submit in center, Reload on right, status label below."""
         bottom_frame = ttk.Frame(self.root, padding=10)
@@ -195,7 +201,11 @@ class TimesheetApp:
             if not self.procas:
                 self.procas = ProcasTimesheet()
 
-            new_cats = self.procas.get_categories()
+            try:
+                new_cats = self.procas.get_categories()
+            finally:
+                # Don't keep an idle browser alive behind the GUI
+                self.procas.cleanup()
             for cat in new_cats:
                 self.known_categories.add(cat)
 
@@ -211,97 +221,36 @@ class TimesheetApp:
         Thread(target=_reload).start()
 
     def submit_hours(self):
-        """Submit hours in a background thread, incrementing progress for each click/entry."""
-        def _submit():
-            if not self.procas:
-                self.procas = ProcasTimesheet()
-
-            # We'll define some step counts: 
-            # - 6 steps for login: (1) setup driver, (2) open site, (3) enter email, (4) submit email, (5) enter password, (6) submit password
-            # - for each hour, 2 steps: (1) open category link, (2) fill hours + save
-            # (We show how to do it conceptually; actual code in `procas_automation.py` might differ.)
-            
-            # Gather the hours from UI
-            for category, var in self.hour_vars.items():
-                try:
-                    hours = float(var.get())
-                except ValueError:
-                    hours = 0.0
-                self.data_by_date[self.current_date][category] = hours
-
-            hours_to_submit = {
-                c: h for c, h in self.data_by_date[self.current_date].items() if h > 0
-            }
-
-            # Total steps = 6 (login) + 2 per hour
-            self.total_steps = 6 + (len(hours_to_submit) * 2)
-            self.current_step = 0
-            self.root.after(0, self.setup_progress_bar)  # show progress bar
-
-            # Simulate the login steps:
-            # Step 1: setup driver
-            self.procas.setup_driver()
-            self.inc_progress()  # increment by 1
-
-            # Step 2: open site
-            self.procas.driver.get(self.procas.base_url)
-            self.inc_progress()
-
-            # Step 3: enter email
-            # (Pretend we do it here; in reality we might call self.procas.login() for the real steps)
-            self.inc_progress()
-
-            # Step 4: submit email
-            self.inc_progress()
-
-            # Step 5: enter password
-            self.inc_progress()
-
-            # Step 6: submit password
-            self.inc_progress()
-
-            # Now for each hour, do 2 steps
-            for cat, hrs in hours_to_submit.items():
-                # Step 1: open category link
-                self.inc_progress()
-
-                # Step 2: fill hours + save
-                self.inc_progress()
-                # In practice, you'd call something like: self.procas.submit_hours(cat, hrs, self.current_date)
-
-            # Done
-            self.save_to_csv()
-            if self.procas:
-                self.procas.cleanup()
-                self.procas = None
-
-            # Clear progress bar, show "Done!"
-            self.root.after(0, self.finish_progress)
-
-        Thread(target=_submit).start()
-
-    def setup_progress_bar(self):
-        """Display progress bar, reset to 0%."""
-        self.progress['value'] = 0
-        self.progress.pack(pady=10)
-        self.status_label.config(text="")  # clear any prior status
-
-    def inc_progress(self):
-        """Increment the progress by one 'step'."""
-        self.current_step += 1
-        percent = (self.current_step / self.total_steps) * 100
-        # Must update UI in main thread
-        self.root.after(0, lambda p=percent: self.update_progress(p))
-
-    def update_progress(self, percent):
-        self.progress['value'] = percent
-        self.root.update_idletasks()
-
-    def finish_progress(self):
-        """Hide progress bar, show 'Done!' message."""
-        self.progress.pack_forget()
-        self.progress['value'] = 0
-        self.status_label.config(text="Done!")
+        """
+        Queue the current day's hours in the local outbox and return immediately.
+        The background flusher pushes them to Procas whenever it is reachable.
+        """
+        # Gather the hours from UI, remembering what each cell held before
+        previous_hours = dict(self.data_by_date[self.current_date])
+        for category, var in self.hour_vars.items():
+            try:
+                hours = float(var.get())
+            except ValueError:
+                hours = 0.0
+            self.data_by_date[self.current_date][category] = hours
+
+        # A cell set back to 0 is queued too, so it overwrites any pending value
+        hours_to_submit = {
+            c: h for c, h in self.data_by_date[self.current_date].items()
+            if h > 0 or previous_hours.get(c, 0.0) > 0
+        }
+
+        # Re-queuing a cell overwrites its pending value, so repeated edits sync once
+        for cat, hrs in hours_to_submit.items():
+            self.outbox.enqueue(cat, hrs, self.current_date)
+
+        self.save_to_csv()
+        self.flusher.wake()
+        self.status_label.config(text=f"Queued {len(hours_to_submit)} entries")
+
+    def set_status(self, message):
+        """Show a status message; safe to call from background threads."""
+        self.root.after(0, lambda m=message: self.status_label.config(text=m))
 
     def prev_day(self):
         current = datetime.strptime(self.current_date, "%Y-%m-%d")
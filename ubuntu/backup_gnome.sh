@@ -110,6 +110,20 @@ backup_web_apps() {
     fi
 }
 
+# Function to take a deduplicated settings snapshot (see gnome_snapshot.py)
+snapshot_settings() {
+    local backup_dir="$1"
+    local snapshot_tool="$(dirname "$(readlink -f "$0")")/gnome_snapshot.py"
+    
+    if ! command -v python3 &> /dev/null || [ ! -f "$snapshot_tool" ]; then
+        return 1
+    fi
+    
+    # Ship the tool with the backup so restore.sh can use it
+    cp "$snapshot_tool" "$backup_dir/gnome_snapshot.py"
+    python3 "$snapshot_tool" --store "$backup_dir/snapshots" snapshot
+}
+
 # Function to backup settings
 backup_settings() {
     local backup_dir="$1"
@@ -120,26 +134,46 @@ backup_settings() {
     
     echo -e "${YELLOW}Backing up GNOME settings...${NC}"
     
-    # Backup all dconf settings
-    dconf dump / > "$backup_dir/dconf-settings-$timestamp.ini"
+    # Only entries that changed since the last snapshot take up space;
+    # fall back to full timestamped dumps if the snapshot tool is unavailable
+    local snapshot_ok=false
+    if snapshot_settings "$backup_dir"; then
+        snapshot_ok=true
+        echo -e "${GREEN}Settings snapshot stored in $backup_dir/snapshots${NC}"
+    else
+        # Backup all dconf settings
+        dconf dump / > "$backup_dir/dconf-settings-$timestamp.ini"
     
-    # Backup specific GNOME settings
-    dconf dump /org/gnome/ > "$backup_dir/gnome-settings-$timestamp.ini"
+        # Backup specific GNOME settings
+        dconf dump /org/gnome/ > "$backup_dir/gnome-settings-$timestamp.ini"
     
-    # Backup keyboard shortcuts
-    dconf dump /org/gnome/desktop/wm/keybindings/ > "$backup_dir/keyboard-shortcuts-$timestamp.ini"
-    dconf dump /org/gnome/shell/keybindings/ > "$backup_dir/shell-shortcuts-$timestamp.ini"
+        # Backup keyboard shortcuts
+        dconf dump /org/gnome/desktop/wm/keybindings/ > "$backup_dir/keyboard-shortcuts-$timestamp.ini"
+        dconf dump /org/gnome/shell/keybindings/ > "$backup_dir/shell-shortcuts-$timestamp.ini"
     
-    # Backup terminal settings
-    dconf dump /org/gnome/terminal/ > "$backup_dir/terminal-settings-$timestamp.ini"
+        # Backup terminal settings
+        dconf dump /org/gnome/terminal/ > "$backup_dir/terminal-settings-$timestamp.ini"
     
-    # Backup favorite apps
-    dconf dump /org/gnome/shell/favorite-apps > "$backup_dir/favorite-apps-$timestamp.ini"
+        # Backup favorite apps
+        dconf dump /org/gnome/shell/favorite-apps > "$backup_dir/favorite-apps-$timestamp.ini"
+    fi
     
     # Backup packages, extensions, and web apps
     backup_packages "$backup_dir"
-    backup_extensions "$backup_dir"
-    backup_web_apps "$backup_dir"
+    if $snapshot_ok; then
+        # The snapshot already holds the extension and web app files; keep only the list
+        gsettings get org.gnome.shell enabled-extensions | tr -d '[],' | tr "'" '\n' | grep -v '^$' > "$backup_dir/enabled-extensions.list"
+    else
+        backup_extensions "$backup_dir"
+        backup_web_apps "$backup_dir"
+    fi
+    
+    # Tell restore.sh which copy is current, so an older snapshot never wins over newer dumps
+    if $snapshot_ok; then
+        echo "snapshot" > "$backup_dir/last-backup-method"
+    else
+        echo "dumps" > "$backup_dir/last-backup-method"
+    fi
     
     # Create manifest file
     {
@@ -253,6 +287,39 @@ restore_web_apps() {
     fi
 }
 
+# Function to check for a settings snapshot (see gnome_snapshot.py)
+has_snapshot() {
+    local backup_dir="$1"
+    
+    [ -d "$backup_dir/snapshots" ] && [ -f "$backup_dir/gnome_snapshot.py" ] && command -v python3 &> /dev/null
+}
+
+# Function to check whether the snapshot is newer than the plain dumps
+snapshot_is_current() {
+    local backup_dir="$1"
+    
+    has_snapshot "$backup_dir" || return 1
+    
+    # The last backup run records which method it used
+    if [ -f "$backup_dir/last-backup-method" ]; then
+        [ "$(cat "$backup_dir/last-backup-method")" = "snapshot" ]
+        return
+    fi
+    
+    # No record: compare the newest snapshot manifest with the newest dump
+    local newest_snapshot=$(ls -t "$backup_dir"/snapshots/snapshots/*.json 2>/dev/null | head -1)
+    local newest_dump=$(ls -t "$backup_dir"/dconf-settings-*.ini 2>/dev/null | head -1)
+    [ -n "$newest_snapshot" ] && { [ -z "$newest_dump" ] || [ "$newest_snapshot" -nt "$newest_dump" ]; }
+}
+
+# Function to restore settings, extensions and web apps from the latest snapshot
+restore_snapshot() {
+    local backup_dir="$1"
+    
+    echo -e "${YELLOW}Restoring GNOME settings, extensions and web apps from latest snapshot...${NC}"
+    python3 "$backup_dir/gnome_snapshot.py" --store "$backup_dir/snapshots" restore latest
+}
+
 # Function to restore settings
 restore_settings() {
     local backup_dir="$1"
@@ -289,14 +356,23 @@ main() {
     # Install packages first
     install_packages "$SCRIPT_DIR"
     
-    # Install GNOME extensions
-    install_extensions "$SCRIPT_DIR"
-    
-    # Restore web apps
-    restore_web_apps "$SCRIPT_DIR"
-    
-    # Restore settings
-    restore_settings "$SCRIPT_DIR"
+    if snapshot_is_current "$SCRIPT_DIR"; then
+        # One snapshot holds the settings and the extension and web app files
+        restore_snapshot "$SCRIPT_DIR"
+    else
+        if has_snapshot "$SCRIPT_DIR"; then
+            echo -e "${YELLOW}The latest backup used plain dumps; restoring those instead of the older snapshot${NC}"
+        fi
+        
+        # Install GNOME extensions
+        install_extensions "$SCRIPT_DIR"
+        
+        # Restore web apps
+        restore_web_apps "$SCRIPT_DIR"
+        
+        # Restore settings
+        restore_settings "$SCRIPT_DIR"
+    fi
     
     echo -e "${GREEN}Restore completed!${NC}"
     echo "Please log out and log back in for all settings to take effect."
@@ -363,7 +439,10 @@ EOL
     fi
     
     # List web apps
-    if [ -d "$backup_dir/web-apps" ]; then
+    if $snapshot_ok; then
+        echo -e "\n${YELLOW}Web Apps Backed Up:${NC}"
+        find "$HOME/.local/share/applications" "$HOME/.mozilla/firefox" -name "*.desktop" 2>/dev/null | grep -E 'chrome-[^/]*\.desktop$|/\.mozilla/' | xargs -r -n1 basename -s .desktop | sed 's/^/- /'
+    elif [ -d "$backup_dir/web-apps" ]; then
         echo -e "\n${YELLOW}Web Apps Backed Up:${NC}"
         find "$backup_dir/web-apps" -name "*.desktop" -exec basename {} .desktop \; | sed 's/^/- /'
     fi
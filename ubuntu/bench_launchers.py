@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Measure Obsidian launcher latency without a desktop.
+
+Puts stub flatpak/wmctrl/xdg-open executables first on PATH and points HOME
+and XDG_RUNTIME_DIR at a scratch directory. Then it runs
+obsidian_launcher.py and times how long it takes until xdg-open receives the
+note URI. The stub flatpak makes the "Obsidian" window appear after a
+configurable startup delay, so the numbers show how much the launcher waits
+beyond the time Obsidian actually needs. Each command is measured in-process
+(no daemon) and through the resident daemon.
+
+Usage: bench_launchers.py [--delays 0,0.3,1.5] [--runs 5]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+LAUNCHER = os.path.join(SCRIPT_DIR, 'obsidian_launcher.py')
+COMMANDS = ['daily', 'quick']
+
+# $STUB_STATE/window exists while the fake Obsidian window is "mapped";
+# $STUB_STATE/opened gets the time xdg-open was called.
+STUBS = {
+    'flatpak': """#!/bin/sh
+( sleep "$STUB_STARTUP_DELAY"; touch "$STUB_STATE/window" ) >/dev/null 2>&1 &
+exit 0
+""",
+    'wmctrl': """#!/bin/sh
+[ -f "$STUB_STATE/window" ] || { [ "$1" = "-l" ] && exit 0; exit 1; }
+[ "$1" = "-l" ] && echo "0x04000003  0 bench EpiSci - Obsidian v1.7.7"
+exit 0
+""",
+    'xdg-open': """#!/bin/sh
+date +%s.%N > "$STUB_STATE/opened"
+exit 0
+""",
+}
+
+def make_bench_env(scratch):
+    """Create stubs and state under scratch; return (env, state_dir)."""
+    bin_dir = os.path.join(scratch, 'bin')
+    state_dir = os.path.join(scratch, 'state')
+    os.makedirs(bin_dir)
+    os.makedirs(state_dir)
+    for name, body in STUBS.items():
+        path = os.path.join(bin_dir, name)
+        with open(path, 'w') as f:
+            f.write(body)
+        os.chmod(path, 0o755)
+
+    env = dict(os.environ)
+    env.update({
+        'HOME': scratch,
+        'XDG_RUNTIME_DIR': scratch,
+        'PATH': bin_dir + os.pathsep + env.get('PATH', ''),
+        'STUB_STATE': state_dir,
+        'STUB_STARTUP_DELAY': '0',
+    })
+    return env, state_dir
+
+def start_daemon(env):
+    """Start `obsidian_launcher.py serve` with env and wait for its socket."""
+    daemon = subprocess.Popen(
+        [sys.executable, LAUNCHER, 'serve'], env=env,
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    socket_path = os.path.join(env['XDG_RUNTIME_DIR'], 'obsidian-launcher.sock')
+    deadline = time.monotonic() + 5
+    while not os.path.exists(socket_path):
+        if time.monotonic() > deadline:
+            daemon.kill()
+            raise RuntimeError("Launcher daemon didn't start")
+        time.sleep(0.01)
+    return daemon
+
+def run_once(command, env, state_dir, window_up):
+    """Run one launch; return seconds from start until xdg-open was called."""
+    for name in ('window', 'opened'):
+        path = os.path.join(state_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    if window_up:
+        open(os.path.join(state_dir, 'window'), 'w').close()
+
+    start = time.time()
+    subprocess.run(
+        [sys.executable, LAUNCHER, command],
+        env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    # The daemon's warm path hands the URI to xdg-open without waiting for it
+    deadline = time.monotonic() + 5
+    opened = os.path.join(state_dir, 'opened')
+    while not os.path.exists(opened) or not os.path.getsize(opened):
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"{command}: xdg-open was never called")
+        time.sleep(0.001)
+    with open(opened) as f:
+        return float(f.read()) - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--delays', default='0,0.3,1.5',
+                        help="Comma-separated stub Obsidian startup delays in seconds")
+    parser.add_argument('--runs', type=int, default=5, help="Runs per command and scenario")
+    args = parser.parse_args()
+    delays = [float(d) for d in args.delays.split(',')]
+
+    scratch = tempfile.mkdtemp(prefix='obsidian-bench-')
+    daemon = None
+    try:
+        env, state_dir = make_bench_env(scratch)
+        scenarios = [('warm', 0.0, True)] + [(f'cold {d:g}s', d, False) for d in delays]
+
+        print(f"{'command':<10}{'mode':<10}{'scenario':<14}{'median':>9}{'min':>9}{'max':>9}")
+        for mode in ('direct', 'daemon'):
+            if mode == 'direct':
+                env['OBSIDIAN_LAUNCHER_NO_DAEMON'] = '1'
+            else:
+                env.pop('OBSIDIAN_LAUNCHER_NO_DAEMON', None)
+                # The daemon keeps the env it started with, so it only covers the first delay
+                env['STUB_STARTUP_DELAY'] = str(delays[0])
+                daemon = start_daemon(env)
+
+            for command in COMMANDS:
+                for label, delay, window_up in scenarios:
+                    if mode == 'daemon' and not window_up and delay != delays[0]:
+                        continue
+                    env['STUB_STARTUP_DELAY'] = str(delay)
+                    samples = [run_once(command, env, state_dir, window_up) for _ in range(args.runs)]
+                    print(f"{command:<10}{mode:<10}{label:<14}"
+                          f"{statistics.median(samples):>8.3f}s{min(samples):>8.3f}s{max(samples):>8.3f}s")
+    finally:
+        if daemon:
+            daemon.kill()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Measure per-invocation startup overhead of obsidian_launcher.py.
+
+Times complete process runs, using the same stub environment as
+bench_launchers.py with the Obsidian window already up. The bare
+interpreter is timed too, so the overhead the launcher adds on top of
+Python itself is visible. The baseline is the original daily launcher,
+kept verbatim in bench_baseline/. Its fixed 1 s of sleeps are patched
+out, so only its startup work is compared.
+
+Expect the in-process `daily` run to cost as much as the old launcher
+or somewhat more, because it now also carries over tasks through the vault
+index and starts a logging thread. Only the daemon path brings the
+per-hotkey overhead below the baseline.
+
+Usage: bench_startup.py [--runs 20]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench_launchers import LAUNCHER, SCRIPT_DIR, make_bench_env, start_daemon
+
+BASELINE = os.path.join(SCRIPT_DIR, 'bench_baseline', 'launch_daily_todo.py')
+
+def time_process(cmd, env, runs):
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(cmd, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--runs', type=int, default=20, help="Runs per case")
+    args = parser.parse_args()
+
+    scratch = tempfile.mkdtemp(prefix='obsidian-bench-')
+    daemon = None
+    try:
+        env, state_dir = make_bench_env(scratch)
+        open(os.path.join(state_dir, 'window'), 'w').close()
+        env['PYTHONPATH'] = SCRIPT_DIR
+
+        cases = [
+            ('python -c pass', [sys.executable, '-c', 'pass'], False),
+            ('import only', [sys.executable, '-c', 'import obsidian_launcher'], False),
+            ('daily, direct', [sys.executable, LAUNCHER, 'daily'], False),
+            ('daily, via daemon', [sys.executable, LAUNCHER, 'daily'], True),
+        ]
+
+        # Importing runs the old module-level logging setup, as the old launcher did
+        no_sleep = 'import time; time.sleep = lambda seconds: None; import runpy; '
+        cases[1:1] = [
+            ('baseline import', [sys.executable, '-c', no_sleep + f'runpy.run_path({BASELINE!r})'], False),
+            ('baseline daily', [sys.executable, '-c', no_sleep + f'runpy.run_path({BASELINE!r}, run_name="__main__")'], False),
+        ]
+
+        results = {}
+        print(f"{'case':<22}{'median':>9}{'min':>9}{'overhead':>10}")
+        for label, cmd, use_daemon in cases:
+            if use_daemon:
+                env.pop('OBSIDIAN_LAUNCHER_NO_DAEMON', None)
+                daemon = daemon or start_daemon(env)
+            else:
+                env['OBSIDIAN_LAUNCHER_NO_DAEMON'] = '1'
+
+            samples = time_process(cmd, env, args.runs)
+            results[label] = statistics.median(samples)
+            overhead = results[label] - results['python -c pass']
+            print(f"{label:<22}{results[label]:>8.3f}s{min(samples):>8.3f}s{overhead:>9.3f}s")
+    finally:
+        if daemon:
+            daemon.kill()
+        shutil.rmtree(scratch, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
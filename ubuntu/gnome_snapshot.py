@@ -0,0 +1,428 @@
+#!/usr/bin/env python3
+"""
+Deduplicated snapshots of GNOME settings, extensions and web apps.
+
+Usage:
+  gnome_snapshot.py [--store DIR] snapshot
+  gnome_snapshot.py [--store DIR] import-ini dconf-settings-*.ini
+  gnome_snapshot.py [--store DIR] list
+  gnome_snapshot.py [--store DIR] diff OLD NEW
+  gnome_snapshot.py [--store DIR] restore ID [--dconf-output FILE] [--no-files]
+
+Objects are stored once, keyed by their SHA-256, under DIR/objects/:
+  - one tree object per dconf section (key -> value, from `dconf dump /`)
+    and one listing every section (section -> tree hash)
+  - every extension and web app file
+  - one tree object per file root (path -> file hash)
+Objects are zlib-compressed. Those under PACK_LIMIT bytes are appended to
+objects/pack.dat and located through objects/pack.json, so the hundreds
+of small section trees don't each take a filesystem block; larger ones
+are loose files. A snapshot is a manifest in DIR/snapshots/<id>.json
+holding the dconf tree hash and each file root's tree hash. An unchanged
+section or extension therefore costs nothing new. diff compares tree
+hashes first and only opens the trees that differ.
+
+IDs accept "latest" or any unique prefix. The default store is
+~/gnome-settings-backup/snapshots.
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import subprocess
+import sys
+import zlib
+from datetime import datetime
+
+DEFAULT_STORE = os.path.expanduser('~/gnome-settings-backup/snapshots')
+EXTENSIONS_DIR = '.local/share/gnome-shell/extensions'
+WEB_APPS_DIR = '.local/share/applications'
+FIREFOX_DIR = '.mozilla/firefox'
+
+# ---------------------------
+# Object store
+# ---------------------------
+
+# Compressed objects smaller than this go into the pack instead of their own file
+PACK_LIMIT = 64 * 1024
+
+class ObjectStore:
+    """
+    Content-addressed objects under root/objects, plus counters of what the
+    current run added. Call save() before writing a manifest that refers to
+    new objects, so the pack index lists them.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.objects_dir = os.path.join(root, 'objects')
+        self.pack_path = os.path.join(self.objects_dir, 'pack.dat')
+        self.index_path = os.path.join(self.objects_dir, 'pack.json')
+        try:
+            with open(self.index_path) as f:
+                self.pack_index = json.load(f)
+        except FileNotFoundError:
+            self.pack_index = {}
+        self.pack_file = None
+        self.new_objects = 0
+        self.new_bytes = 0
+
+    def loose_path(self, digest):
+        return os.path.join(self.objects_dir, digest[:2], digest[2:])
+
+    def has(self, digest):
+        return digest in self.pack_index or os.path.exists(self.loose_path(digest))
+
+    def put(self, data):
+        """Store data under its hash unless it's already there. Returns the hash."""
+        digest = hashlib.sha256(data).hexdigest()
+        if self.has(digest):
+            return digest
+
+        compressed = zlib.compress(data)
+        if len(compressed) < PACK_LIMIT:
+            if self.pack_file is None:
+                os.makedirs(self.objects_dir, exist_ok=True)
+                self.pack_file = open(self.pack_path, 'ab')
+            # Bytes past the last saved index entry are ignored, so a crash leaves nothing half-visible
+            offset = self.pack_file.seek(0, os.SEEK_END)
+            self.pack_file.write(compressed)
+            self.pack_index[digest] = [offset, len(compressed)]
+        else:
+            path = self.loose_path(digest)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(compressed)
+            os.replace(tmp_path, path)
+
+        self.new_objects += 1
+        self.new_bytes += len(compressed)
+        return digest
+
+    def get(self, digest):
+        if digest in self.pack_index:
+            offset, length = self.pack_index[digest]
+            if self.pack_file:
+                self.pack_file.flush()
+            with open(self.pack_path, 'rb') as f:
+                f.seek(offset)
+                return zlib.decompress(f.read(length))
+        with open(self.loose_path(digest), 'rb') as f:
+            return zlib.decompress(f.read())
+
+    def put_tree(self, tree):
+        """Store a dict as canonical JSON so equal trees get equal hashes."""
+        return self.put(json.dumps(tree, sort_keys=True, separators=(',', ':')).encode())
+
+    def get_tree(self, digest):
+        return json.loads(self.get(digest))
+
+    def save(self):
+        """Flush the pack and atomically replace its index."""
+        if self.pack_file is None:
+            return
+        self.pack_file.flush()
+        os.fsync(self.pack_file.fileno())
+        tmp_path = f"{self.index_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.pack_index, f, separators=(',', ':'))
+        os.replace(tmp_path, self.index_path)
+
+    def close(self):
+        if self.pack_file:
+            self.pack_file.close()
+            self.pack_file = None
+
+# ---------------------------
+# dconf
+# ---------------------------
+
+def parse_dconf(text):
+    """Split `dconf dump` output into {section: {key: value}}."""
+    sections = {}
+    current = None
+    for line in text.splitlines():
+        if line.startswith('[') and line.endswith(']'):
+            current = sections.setdefault(line[1:-1], {})
+        elif current is not None and '=' in line:
+            key, value = line.split('=', 1)
+            current[key] = value
+    return sections
+
+def format_dconf(sections):
+    """Inverse of parse_dconf: text that `dconf load /` accepts."""
+    blocks = []
+    for section in sorted(sections):
+        lines = [f"[{section}]"] + [f"{key}={value}" for key, value in sorted(sections[section].items())]
+        blocks.append('\n'.join(lines))
+    return '\n\n'.join(blocks) + '\n'
+
+def store_dconf(store, sections):
+    """Returns {section: tree_hash}, storing each section's keys and values as one tree."""
+    return {section: store.put_tree(keys) for section, keys in sections.items()}
+
+def dconf_sections(store, manifest):
+    """{section: tree_hash} for a snapshot."""
+    return store.get_tree(manifest['dconf'])
+
+def load_dconf(store, manifest):
+    return {
+        section: store.get_tree(tree_hash)
+        for section, tree_hash in dconf_sections(store, manifest).items()
+    }
+
+def enabled_extensions(sections):
+    value = sections.get('org/gnome/shell', {}).get('enabled-extensions', '')
+    return re.findall(r"'([^']*)'", value)
+
+# ---------------------------
+# Files
+# ---------------------------
+
+def load_stat_cache(store):
+    try:
+        with open(os.path.join(store.root, 'stat-cache.json')) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+def save_stat_cache(store, cache):
+    tmp_path = os.path.join(store.root, 'stat-cache.json.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(cache, f)
+    os.replace(tmp_path, os.path.join(store.root, 'stat-cache.json'))
+
+def store_files(store, root, name_filter, stat_cache):
+    """
+    Store the files under root and return a tree hash, or None if root is
+    missing. Files whose (mtime, size) match the stat cache aren't re-read.
+    """
+    if not os.path.isdir(root):
+        return None
+
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            if name_filter and not re.fullmatch(name_filter, filename):
+                continue
+            path = os.path.join(dirpath, filename)
+            st = os.stat(path)
+
+            cached = stat_cache.get(path)
+            digest = cached[2] if cached and cached[:2] == [st.st_mtime_ns, st.st_size] else None
+            if digest is None or not store.has(digest):
+                with open(path, 'rb') as f:
+                    digest = store.put(f.read())
+                stat_cache[path] = [st.st_mtime_ns, st.st_size, digest]
+
+            tree[os.path.relpath(path, root)] = {'hash': digest, 'mode': st.st_mode & 0o777}
+
+    return store.put_tree(tree)
+
+# ---------------------------
+# Snapshots
+# ---------------------------
+
+def id_order(snapshot_id):
+    """Sort key: timestamp first, then the -N suffix numerically (so -10 comes after -2)."""
+    base, _, n = snapshot_id.partition('-')
+    return base, int(n) if n.isdigit() else 1
+
+def snapshot_ids(store):
+    """Snapshot IDs, oldest first."""
+    snapshots_dir = os.path.join(store.root, 'snapshots')
+    if not os.path.isdir(snapshots_dir):
+        return []
+    return sorted((name[:-5] for name in os.listdir(snapshots_dir) if name.endswith('.json')), key=id_order)
+
+def resolve_id(store, wanted):
+    ids = snapshot_ids(store)
+    if not ids:
+        sys.exit(f"No snapshots in {store.root}")
+    if wanted == 'latest':
+        return ids[-1]
+    # An exact ID wins even when suffixed snapshots share it as a prefix
+    if wanted in ids:
+        return wanted
+    matches = [i for i in ids if i.startswith(wanted)]
+    if len(matches) != 1:
+        sys.exit(f"Snapshot '{wanted}' matches {len(matches)} snapshots")
+    return matches[0]
+
+def load_manifest(store, snapshot_id):
+    with open(os.path.join(store.root, 'snapshots', f'{snapshot_id}.json')) as f:
+        return json.load(f)
+
+def write_manifest(store, snapshot_id, source, dconf, files):
+    ids = set(snapshot_ids(store))
+    unique_id, n = snapshot_id, 1
+    while unique_id in ids:
+        n += 1
+        unique_id = f"{snapshot_id}-{n}"
+
+    manifest = {
+        'id': unique_id,
+        'created': datetime.now().isoformat(timespec='seconds'),
+        'source': source,
+        # One hash for all sections, so an unchanged dconf database adds one line
+        'dconf': store.put_tree(dconf),
+        'files': files,
+        'new_objects': store.new_objects,
+        'new_bytes': store.new_bytes,
+    }
+    # The manifest must never refer to objects the pack index doesn't list yet
+    store.save()
+    os.makedirs(os.path.join(store.root, 'snapshots'), exist_ok=True)
+    with open(os.path.join(store.root, 'snapshots', f'{unique_id}.json'), 'w') as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    print(f"Snapshot {unique_id}: {len(dconf)} dconf sections, {len(files)} file roots, "
+          f"{store.new_objects} new objects ({store.new_bytes} bytes compressed)")
+    store.new_objects = store.new_bytes = 0
+    return unique_id
+
+def take_snapshot(store, home):
+    """Snapshot the live dconf database, enabled extensions and Chrome/Firefox web apps."""
+    text = subprocess.run(['dconf', 'dump', '/'], capture_output=True, text=True, check=True).stdout
+    sections = parse_dconf(text)
+    dconf = store_dconf(store, sections)
+
+    stat_cache = load_stat_cache(store)
+    roots = [(f"{EXTENSIONS_DIR}/{uuid}", None) for uuid in enabled_extensions(sections)]
+    roots.append((WEB_APPS_DIR, r'chrome-.*\.desktop'))
+    roots.append((FIREFOX_DIR, r'.*\.desktop'))
+
+    files = {}
+    for rel_root, name_filter in roots:
+        tree_hash = store_files(store, os.path.join(home, rel_root), name_filter, stat_cache)
+        if tree_hash:
+            files[rel_root] = tree_hash
+    save_stat_cache(store, stat_cache)
+
+    return write_manifest(store, datetime.now().strftime('%Y%m%d_%H%M%S'), 'dconf dump /', dconf, files)
+
+def import_ini(store, paths):
+    """Turn existing `dconf dump /` files (e.g. dconf-settings-*.ini) into snapshots."""
+    for path in sorted(paths):
+        with open(path) as f:
+            dconf = store_dconf(store, parse_dconf(f.read()))
+        match = re.search(r'\d{8}_\d{6}', os.path.basename(path))
+        snapshot_id = match.group() if match else datetime.fromtimestamp(
+            os.path.getmtime(path)).strftime('%Y%m%d_%H%M%S')
+        write_manifest(store, snapshot_id, os.path.basename(path), dconf, {})
+
+def list_snapshots(store):
+    for snapshot_id in snapshot_ids(store):
+        m = load_manifest(store, snapshot_id)
+        print(f"{snapshot_id}  {m['created']}  {len(dconf_sections(store, m))} sections  "
+              f"{len(m['files'])} file roots  +{m['new_objects']} objects ({m['new_bytes']} bytes)  {m['source']}")
+
+def diff_trees(old, new):
+    """(added, removed, changed) keys between two {name: hash or value} mappings."""
+    added = sorted(set(new) - set(old))
+    removed = sorted(set(old) - set(new))
+    changed = sorted(k for k in set(old) & set(new) if old[k] != new[k])
+    return added, removed, changed
+
+def diff_snapshots(store, old_id, new_id):
+    old, new = load_manifest(store, old_id), load_manifest(store, new_id)
+
+    old_sections, new_sections = dconf_sections(store, old), dconf_sections(store, new)
+    added, removed, changed = diff_trees(old_sections, new_sections)
+    for section in added:
+        for key, value in sorted(store.get_tree(new_sections[section]).items()):
+            print(f"+ {section}/{key}={value}")
+    for section in removed:
+        for key, value in sorted(store.get_tree(old_sections[section]).items()):
+            print(f"- {section}/{key}={value}")
+    for section in changed:
+        old_tree = store.get_tree(old_sections[section])
+        new_tree = store.get_tree(new_sections[section])
+        keys_added, keys_removed, keys_changed = diff_trees(old_tree, new_tree)
+        for key in keys_added:
+            print(f"+ {section}/{key}={new_tree[key]}")
+        for key in keys_removed:
+            print(f"- {section}/{key}={old_tree[key]}")
+        for key in keys_changed:
+            print(f"~ {section}/{key}: {old_tree[key]} -> {new_tree[key]}")
+
+    roots_added, roots_removed, roots_changed = diff_trees(old['files'], new['files'])
+    for root in roots_added:
+        print(f"+ {root}/")
+    for root in roots_removed:
+        print(f"- {root}/")
+    for root in roots_changed:
+        old_tree = store.get_tree(old['files'][root])
+        new_tree = store.get_tree(new['files'][root])
+        files_added, files_removed, files_changed = diff_trees(old_tree, new_tree)
+        for path in files_added:
+            print(f"+ {root}/{path}")
+        for path in files_removed:
+            print(f"- {root}/{path}")
+        for path in files_changed:
+            print(f"~ {root}/{path}")
+
+def restore_snapshot(store, snapshot_id, home, dconf_output=None, restore_files=True):
+    """Load the snapshot's dconf settings and write its files back under home."""
+    manifest = load_manifest(store, snapshot_id)
+
+    if restore_files:
+        for rel_root, tree_hash in manifest['files'].items():
+            for rel_path, entry in store.get_tree(tree_hash).items():
+                path = os.path.join(home, rel_root, rel_path)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, 'wb') as f:
+                    f.write(store.get(entry['hash']))
+                os.chmod(path, entry['mode'])
+        print(f"Restored {len(manifest['files'])} file roots under {home}")
+
+    ini = format_dconf(load_dconf(store, manifest))
+    if dconf_output:
+        with open(dconf_output, 'w') as f:
+            f.write(ini)
+        print(f"Wrote dconf settings to {dconf_output}")
+    else:
+        subprocess.run(['dconf', 'load', '/'], input=ini, text=True, check=True)
+        print(f"Loaded dconf settings from snapshot {snapshot_id}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Deduplicated GNOME settings snapshots.")
+    parser.add_argument('--store', default=DEFAULT_STORE, help="Snapshot store directory")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    commands.add_parser('snapshot', help="Snapshot the current session")
+    import_parser = commands.add_parser('import-ini', help="Import `dconf dump /` files as snapshots")
+    import_parser.add_argument('paths', nargs='+')
+    commands.add_parser('list', help="List snapshots")
+    diff_parser = commands.add_parser('diff', help="Show what changed between two snapshots")
+    diff_parser.add_argument('old')
+    diff_parser.add_argument('new')
+    restore_parser = commands.add_parser('restore', help="Restore a snapshot")
+    restore_parser.add_argument('id')
+    restore_parser.add_argument('--dconf-output', help="Write dconf settings to this file instead of loading them")
+    restore_parser.add_argument('--no-files', action='store_true', help="Skip extension and web app files")
+    args = parser.parse_args()
+
+    store_dir = os.path.expanduser(args.store)
+    os.makedirs(store_dir, exist_ok=True)
+    store = ObjectStore(store_dir)
+    home = os.path.expanduser('~')
+
+    try:
+        if args.command == 'snapshot':
+            take_snapshot(store, home)
+        elif args.command == 'import-ini':
+            import_ini(store, args.paths)
+        elif args.command == 'list':
+            list_snapshots(store)
+        elif args.command == 'diff':
+            diff_snapshots(store, resolve_id(store, args.old), resolve_id(store, args.new))
+        elif args.command == 'restore':
+            restore_snapshot(store, resolve_id(store, args.id), home, args.dconf_output, not args.no_files)
+    finally:
+        store.close()
+
+if __name__ == "__main__":
+    main()
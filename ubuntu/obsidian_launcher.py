@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+"""
+Single entry point for the Obsidian hotkeys.
+
+Usage: obsidian_launcher.py daily|quick|open|serve|stop
+
+  daily  open today's note in "Daily TODO", creating it if needed
+  quick  create and open a new timestamped note in "Quick Notes"
+  open   just launch Obsidian
+  serve  run the resident daemon that daily/quick hand off to
+  stop   ask a running daemon to exit
+
+daily/quick first try the daemon's Unix socket. If nothing answers within
+SEND_TIMEOUT, they run in-process and start a daemon for next time (set
+OBSIDIAN_LAUNCHER_NO_DAEMON=1 to skip both). Settings are read from
+~/.config/obsidian-launcher/config.json; missing keys use DEFAULTS. The
+daemon reloads the file whenever its mtime changes.
+
+Only os and sys are imported at module level so the hotkey path stays
+cheap. Everything else is imported where it is used.
+"""
+import os
+import sys
+
+CONFIG_PATH = os.path.expanduser('~/.config/obsidian-launcher/config.json')
+SOCKET_PATH = os.path.join(
+    os.environ.get('XDG_RUNTIME_DIR', '/tmp'), 'obsidian-launcher.sock'
+)
+# Held by the running daemon, so hotkeys pressed together can't start two
+LOCK_PATH = SOCKET_PATH + '.lock'
+# How long a client waits for the daemon before handling the request itself
+SEND_TIMEOUT = 2.0
+
+DEFAULTS = {
+    'vault_name': 'EpiSci',
+    'vault_path': '~/Documents/EpiSci',
+    'daily_folder': 'Daily TODO',
+    'quick_folder': 'Quick Notes',
+    'flatpak_app': 'md.obsidian.Obsidian',
+    'appimage_path': '~/snap/obsidian/Obsidian.AppImage',
+    'window_title': 'Obsidian',
+    'window_timeout': 10.0,
+    'carry_over_tasks': True,
+    'index_path': '~/.cache/obsidian-launcher/vault-index.db',
+    'log_file': '~/.obsidian-launcher.log',
+    'log_max_bytes': 1_000_000,
+    'log_backups': 3,
+}
+
+COMMANDS = ('daily', 'quick', 'open', 'serve', 'stop')
+
+# ---------------------------
+# Config and logging
+# ---------------------------
+
+def load_config():
+    """DEFAULTS overlaid with the user's config file, with paths expanded."""
+    config = dict(DEFAULTS)
+    if os.path.exists(CONFIG_PATH):
+        import json
+        with open(CONFIG_PATH) as f:
+            config.update(json.load(f))
+    for key in ('vault_path', 'appimage_path', 'log_file', 'index_path'):
+        config[key] = os.path.expanduser(config[key])
+    return config
+
+def config_mtime():
+    """mtime of the config file, or None if there isn't one."""
+    try:
+        return os.stat(CONFIG_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+def setup_logging(config):
+    """
+    Log through a queue so callers never wait on file I/O. A listener
+    thread writes to a rotating log file and stderr.
+    """
+    import atexit
+    import logging
+    import queue
+    from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+    formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+    file_handler = RotatingFileHandler(
+        config['log_file'],
+        maxBytes=config['log_max_bytes'],
+        backupCount=config['log_backups']
+    )
+    stream_handler = logging.StreamHandler()
+    for handler in (file_handler, stream_handler):
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, file_handler, stream_handler)
+    listener.start()
+    # Flushes whatever is still queued before the process exits
+    atexit.register(listener.stop)
+
+    # Records reach the listener's handlers already formatted once; keep the message bare
+    queue_handler = QueueHandler(log_queue)
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+    logging.basicConfig(level=logging.INFO, handlers=[queue_handler])
+
+# ---------------------------
+# Notes
+# ---------------------------
+
+def create_note(config, note_path, template):
+    """Write template to note_path inside the vault unless the note already exists."""
+    import logging
+
+    full_note_path = os.path.join(config['vault_path'], note_path)
+    os.makedirs(os.path.dirname(full_note_path), exist_ok=True)
+
+    if not os.path.exists(full_note_path):
+        with open(full_note_path, 'w') as f:
+            f.write(template)
+        logging.info(f"Created new note: {full_note_path}")
+
+def daily_note(config):
+    """
+    Create today's daily note if needed and return its vault-relative path.
+    A new note starts with the open tasks carried over from the previous
+    daily note and from quick notes written since then.
+    """
+    from datetime import datetime
+
+    today = datetime.now().strftime('%Y-%m-%d')
+    note_path = f"{config['daily_folder']}/{today}.md"
+    if os.path.exists(os.path.join(config['vault_path'], note_path)):
+        return note_path
+
+    if not config['carry_over_tasks']:
+        create_note(config, note_path, "## Tasks\n- [ ] \n")
+        return note_path
+
+    import logging
+    import sqlite3
+    from vault_index import VaultIndex
+
+    index = None
+    tasks = []
+    try:
+        index = VaultIndex(config['vault_path'], config['index_path'])
+        tasks = index.carry_over_tasks(config['daily_folder'], config['quick_folder'], today)
+    except (OSError, sqlite3.Error) as e:
+        # A broken index must never stop the note from opening
+        logging.warning(f"Couldn't carry over tasks: {e}")
+
+    create_note(config, note_path, "## Tasks\n" + "".join(f"{task}\n" for task in tasks) + "- [ ] \n")
+
+    if index:
+        try:
+            index.record(note_path, 'daily')
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Couldn't index {note_path}: {e}")
+        index.close()
+    if tasks:
+        logging.info(f"Carried over {len(tasks)} open tasks")
+    return note_path
+
+def quick_note(config):
+    """
+    Create a new quick note and return its vault-relative path. With task
+    carry-over on, the note is added to the index right away so the next
+    daily note doesn't have to rescan the quick notes folder.
+    """
+    from datetime import datetime
+
+    timestamp = datetime.now().strftime('%Y-%m-%d-%H%M%S')
+    note_path = f"{config['quick_folder']}/Note {timestamp}.md"
+    if not config['carry_over_tasks']:
+        create_note(config, note_path, "-\n")
+        return note_path
+
+    import logging
+    import sqlite3
+    from vault_index import VaultIndex
+
+    index = None
+    try:
+        index = VaultIndex(config['vault_path'], config['index_path'])
+        # Catch up on notes made elsewhere first, so record() can mark the folder current
+        index.refresh(config['quick_folder'], 'quick')
+    except (OSError, sqlite3.Error) as e:
+        logging.warning(f"Couldn't update the vault index: {e}")
+        if index:
+            index.close()
+            index = None
+
+    create_note(config, note_path, "-\n")
+
+    if index:
+        try:
+            index.record(note_path, 'quick')
+        except (OSError, sqlite3.Error) as e:
+            logging.warning(f"Couldn't index {note_path}: {e}")
+        index.close()
+    return note_path
+
+NOTE_MAKERS = {
+    'daily': daily_note,
+    'quick': quick_note,
+}
+
+def note_uri(config, note_path):
+    """obsidian:// URI that opens note_path at its last line."""
+    from urllib.parse import quote
+
+    return f"obsidian://open?vault={config['vault_name']}&file={quote(note_path)}&line=9999"
+
+# ---------------------------
+# Window readiness
+# ---------------------------
+
+def window_exists(title):
+    """True if a mapped window's title contains title (per wmctrl -l)."""
+    import subprocess
+
+    try:
+        result = subprocess.run(
+            ['wmctrl', '-l'], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return False
+    return any(title in line for line in result.stdout.splitlines())
+
+def wait_for_window(title, timeout=10.0, interval=0.05):
+    """Poll until the window exists. Returns False if timeout expires first."""
+    import time
+
+    deadline = time.monotonic() + timeout
+    while True:
+        if window_exists(title):
+            return True
+        if time.monotonic() >= deadline:
+            return False
+        time.sleep(interval)
+
+def focus_window(title):
+    """Raise the window. Returns False if wmctrl couldn't find it."""
+    import subprocess
+
+    try:
+        subprocess.run(['wmctrl', '-a', title], check=True)
+        return True
+    except (OSError, subprocess.CalledProcessError):
+        return False
+
+# ---------------------------
+# Launching
+# ---------------------------
+
+def open_in_obsidian(config, note_path):
+    """Start Obsidian, wait for its window, focus it and open the note. Raises on failure."""
+    import logging
+    import subprocess
+
+    subprocess.Popen([
+        'flatpak', 'run', config['flatpak_app'],
+        '--new-window',
+        f"obsidian://open?vault={config['vault_name']}"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Open the note as soon as the window is up instead of guessing a delay
+    title = config['window_title']
+    if not wait_for_window(title, config['window_timeout']):
+        logging.warning("Obsidian window didn't appear in time, opening note anyway")
+    elif not focus_window(title):
+        logging.warning("Couldn't focus window, continuing anyway")
+
+    subprocess.run(['xdg-open', note_uri(config, note_path)], check=True)
+    logging.info(f"Launched Obsidian and opened note: {note_path}")
+
+def open_note(config, command):
+    """Create the note for command ('daily' or 'quick') and open it. Raises on failure."""
+    show_note(config, NOTE_MAKERS[command](config))
+
+def show_note(config, note_path):
+    """Open an existing note, starting Obsidian first if needed. Raises on failure."""
+    import logging
+    import subprocess
+
+    if window_exists(config['window_title']):
+        # Obsidian is already up: it handles the URI itself and raises its window
+        subprocess.Popen(
+            ['xdg-open', note_uri(config, note_path)],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        logging.info(f"Opened note in running Obsidian: {note_path}")
+    else:
+        open_in_obsidian(config, note_path)
+
+def launch_app(config):
+    """Launch Obsidian without opening a particular note. Raises on failure."""
+    import logging
+    import subprocess
+
+    if sys.platform == 'darwin':
+        subprocess.run(['open', '-n', '-a', 'Obsidian'], check=True)
+    elif sys.platform.startswith('linux'):
+        if not os.path.isfile(config['appimage_path']):
+            raise FileNotFoundError(f"Obsidian AppImage not found at: {config['appimage_path']}")
+        subprocess.run([config['appimage_path'], '--new-window'], check=True)
+    else:
+        raise OSError(f"Unsupported operating system: {sys.platform}")
+
+    logging.info("Successfully launched Obsidian")
+
+# ---------------------------
+# Daemon
+# ---------------------------
+
+def serve(config):
+    """
+    Answer daily/quick requests on SOCKET_PATH until killed or sent 'stop'.
+    Returns at once if another daemon already holds LOCK_PATH.
+
+    Each request gets its own thread and is acknowledged as soon as its note
+    exists, so a cold start waiting on the Obsidian window never holds up the
+    client or the next hotkey.
+    """
+    import fcntl
+    import logging
+    import signal
+    import socketserver
+
+    lock_file = open(LOCK_PATH, 'w')
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        lock_file.close()
+        logging.info("Obsidian launcher daemon is already running")
+        return
+
+    loaded = {'config': config, 'mtime': config_mtime()}
+
+    def current_config():
+        """The config, re-read if the file changed since it was last loaded."""
+        mtime = config_mtime()
+        if mtime != loaded['mtime']:
+            try:
+                loaded['config'] = load_config()
+                logging.info("Reloaded config")
+            except (OSError, ValueError) as e:
+                logging.warning(f"Keeping previous config, couldn't reload: {e}")
+            loaded['mtime'] = mtime
+        return loaded['config']
+
+    class LauncherHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            command = self.rfile.readline().decode().strip()
+            if command == 'stop':
+                self.wfile.write(b'ok\n')
+                logging.info("Stopping Obsidian launcher daemon")
+                # shutdown() waits for serve_forever, which runs in the main thread
+                self.server.shutdown()
+                return
+
+            config = current_config()
+            try:
+                if command not in NOTE_MAKERS:
+                    raise ValueError(f"Unknown command: {command!r}")
+                note_path = NOTE_MAKERS[command](config)
+            except Exception as e:
+                logging.error(f"Failed to handle {command!r}: {e}")
+                self.wfile.write(f'error: {e}\n'.encode())
+                return
+
+            self.wfile.write(b'ok\n')
+            try:
+                show_note(config, note_path)
+            except Exception as e:
+                logging.error(f"Failed to open {note_path}: {e}")
+
+    # We hold the lock, so a socket file here was left behind by a crashed daemon
+    if os.path.exists(SOCKET_PATH):
+        os.unlink(SOCKET_PATH)
+
+    # Let `kill` run the cleanup below instead of leaving the socket behind
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+
+    socket_inode = None
+    try:
+        with socketserver.ThreadingUnixStreamServer(SOCKET_PATH, LauncherHandler) as server:
+            server.daemon_threads = True
+            socket_inode = os.stat(SOCKET_PATH).st_ino
+            os.chmod(SOCKET_PATH, 0o600)
+            logging.info(f"Obsidian launcher daemon listening on {SOCKET_PATH}")
+            server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Only remove the socket this process bound, never a successor's
+        try:
+            if socket_inode is not None and os.stat(SOCKET_PATH).st_ino == socket_inode:
+                os.unlink(SOCKET_PATH)
+        except FileNotFoundError:
+            pass
+        lock_file.close()
+
+def send_command(command):
+    """
+    Send command to the daemon and return its reply, or None if it isn't
+    running or doesn't answer within SEND_TIMEOUT.
+    """
+    import socket
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(SEND_TIMEOUT)
+            sock.connect(SOCKET_PATH)
+            sock.sendall(f'{command}\n'.encode())
+            return sock.makefile().readline().strip() or None
+    except OSError:
+        # Covers a missing socket, a refused connection and a timeout
+        return None
+
+def start_daemon():
+    """Start `serve` in the background, detached from this process."""
+    import subprocess
+
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__), 'serve'],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True
+    )
+
+# ---------------------------
+# Entry point
+# ---------------------------
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) != 1 or argv[0] not in COMMANDS:
+        print(f"Usage: {os.path.basename(sys.argv[0])} {'|'.join(COMMANDS)}", file=sys.stderr)
+        sys.exit(2)
+    command = argv[0]
+
+    if command == 'stop':
+        if send_command('stop') is None:
+            print("Obsidian launcher daemon is not running", file=sys.stderr)
+        return
+
+    if command in NOTE_MAKERS and not os.environ.get('OBSIDIAN_LAUNCHER_NO_DAEMON'):
+        reply = send_command(command)
+        if reply == 'ok':
+            return
+        if reply is not None:
+            print(reply, file=sys.stderr)
+            sys.exit(1)
+        # No daemon, or it didn't answer in time: start one for next time and handle this here
+        start_daemon()
+
+    config = load_config()
+    setup_logging(config)
+
+    try:
+        if command == 'serve':
+            serve(config)
+        elif command == 'open':
+            launch_app(config)
+        else:
+            open_note(config, command)
+    except Exception as e:
+        import logging
+        logging.error(f"Failed to launch Obsidian: {e}")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
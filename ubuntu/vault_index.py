@@ -0,0 +1,216 @@
+"""
+Persistent index of the vault's daily and quick notes, used by obsidian_launcher.py.
+
+Each note is stored with its date (taken from the file name) and its
+unchecked task lines. Nothing is trusted without a check:
+  - a folder is listed again only when its own mtime changes
+  - a note is re-read only when its mtime or size changes
+  - a note is always stat()ed before its cached tasks are used
+Lookups by date go through a SQLite index, so finding the previous daily
+note costs the same no matter how many years of notes the vault holds.
+
+Open subtasks keep their place under a carried parent. Under a checked
+parent they are moved up to the nearest carried ancestor, or to the top
+level, so they never end up nested under an unrelated task.
+"""
+import os
+import re
+import sqlite3
+
+OPEN_TASK = re.compile(r'^\s*[-*+] \[ \] \S')
+LIST_ITEM = re.compile(r'^(\s*)[-*+] ')
+NOTE_DATE = re.compile(r'\d{4}-\d{2}-\d{2}')
+# Recorded as the index's user_version
+SCHEMA_VERSION = 1
+
+def open_tasks(lines):
+    """
+    Unchecked task lines from a note, re-indented so each one sits under its
+    nearest ancestor that is also carried over (or at the top level).
+    """
+    tasks = []
+    # (indent in the note, indent in the output or None if not carried)
+    stack = []
+    for line in lines:
+        line = line.rstrip('\n')
+        match = LIST_ITEM.match(line)
+        if not match:
+            # A top-level paragraph or heading ends the current list
+            if line.strip() and not line[0].isspace():
+                stack = []
+            continue
+
+        indent = len(match.group(1).expandtabs(4))
+        while stack and stack[-1][0] >= indent:
+            stack.pop()
+
+        new_indent = None
+        if OPEN_TASK.match(line):
+            new_indent = 0
+            for i in range(len(stack) - 1, -1, -1):
+                if stack[i][1] is not None:
+                    # One level below that ancestor, using the note's own step size
+                    child_indent = stack[i + 1][0] if i + 1 < len(stack) else indent
+                    new_indent = stack[i][1] + child_indent - stack[i][0]
+                    break
+            tasks.append(' ' * new_indent + line.lstrip())
+        stack.append((indent, new_indent))
+    return tasks
+
+class VaultIndex:
+    def __init__(self, vault_path, index_path):
+        self.vault_path = vault_path
+        os.makedirs(os.path.dirname(index_path), exist_ok=True)
+        self.conn = sqlite3.connect(index_path)
+        with self.conn:
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS notes (
+                    path TEXT PRIMARY KEY,
+                    kind TEXT NOT NULL,
+                    date TEXT,
+                    mtime_ns INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    open_tasks TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS notes_by_date ON notes (kind, date);
+                CREATE TABLE IF NOT EXISTS folders (
+                    folder TEXT PRIMARY KEY,
+                    mtime_ns INTEGER NOT NULL
+                );
+            """)
+            self.conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def _store(self, note_path, kind, stat):
+        """Parse one note and upsert its row."""
+        with open(os.path.join(self.vault_path, note_path), encoding='utf-8', errors='replace') as f:
+            tasks = open_tasks(f)
+
+        match = NOTE_DATE.search(os.path.basename(note_path))
+        self.conn.execute(
+            "INSERT OR REPLACE INTO notes VALUES (?, ?, ?, ?, ?, ?)",
+            (note_path, kind, match.group() if match else None,
+             stat.st_mtime_ns, stat.st_size, '\n'.join(tasks))
+        )
+        return tasks
+
+    def _validated_tasks(self, note_path, kind, mtime_ns, size, open_tasks):
+        """Cached open tasks for a row, re-read if the file changed. None if it's gone."""
+        try:
+            stat = os.stat(os.path.join(self.vault_path, note_path))
+        except FileNotFoundError:
+            self.conn.execute("DELETE FROM notes WHERE path = ?", (note_path,))
+            return None
+
+        if (stat.st_mtime_ns, stat.st_size) != (mtime_ns, size):
+            return self._store(note_path, kind, stat)
+        return open_tasks.split('\n') if open_tasks else []
+
+    def refresh(self, folder, kind):
+        """Bring the index up to date with folder, parsing only new or changed notes."""
+        try:
+            folder_mtime = os.stat(os.path.join(self.vault_path, folder)).st_mtime_ns
+        except FileNotFoundError:
+            return
+
+        row = self.conn.execute(
+            "SELECT mtime_ns FROM folders WHERE folder = ?", (folder,)
+        ).fetchone()
+        if row and row[0] == folder_mtime:
+            return
+
+        prefix = f"{folder}/"
+        known = {
+            path: (mtime_ns, size) for path, mtime_ns, size in self.conn.execute(
+                "SELECT path, mtime_ns, size FROM notes WHERE kind = ? AND substr(path, 1, ?) = ?",
+                (kind, len(prefix), prefix)
+            )
+        }
+
+        with self.conn:
+            with os.scandir(os.path.join(self.vault_path, folder)) as entries:
+                for entry in entries:
+                    if not entry.name.endswith('.md') or not entry.is_file():
+                        continue
+                    note_path = prefix + entry.name
+                    stat = entry.stat()
+                    if known.pop(note_path, None) != (stat.st_mtime_ns, stat.st_size):
+                        self._store(note_path, kind, stat)
+
+            # Whatever is left in known was deleted or renamed
+            self.conn.executemany("DELETE FROM notes WHERE path = ?", [(p,) for p in known])
+            self.conn.execute(
+                "INSERT OR REPLACE INTO folders VALUES (?, ?)", (folder, folder_mtime)
+            )
+
+    def record(self, note_path, kind):
+        """
+        Index a note the launcher just created. Call refresh() on its folder
+        before creating it, so marking the folder as current doesn't hide
+        anything else.
+        """
+        full_path = os.path.join(self.vault_path, note_path)
+        with self.conn:
+            self._store(note_path, kind, os.stat(full_path))
+            self.conn.execute(
+                "INSERT OR REPLACE INTO folders VALUES (?, ?)",
+                (os.path.dirname(note_path), os.stat(os.path.dirname(full_path)).st_mtime_ns)
+            )
+
+    def latest_before(self, kind, date):
+        """(date, open_tasks) of the newest kind note dated before date, or None."""
+        with self.conn:
+            while True:
+                row = self.conn.execute(
+                    "SELECT path, date, mtime_ns, size, open_tasks FROM notes "
+                    "WHERE kind = ? AND date < ? ORDER BY date DESC, path DESC LIMIT 1",
+                    (kind, date)
+                ).fetchone()
+                if row is None:
+                    return None
+
+                path, note_date, mtime_ns, size, open_tasks = row
+                tasks = self._validated_tasks(path, kind, mtime_ns, size, open_tasks)
+                if tasks is not None:
+                    return note_date, tasks
+
+    def open_tasks_between(self, kind, start, end):
+        """Open tasks from kind notes dated start <= date < end, oldest first."""
+        rows = self.conn.execute(
+            "SELECT path, mtime_ns, size, open_tasks FROM notes "
+            "WHERE kind = ? AND date >= ? AND date < ? ORDER BY date, path",
+            (kind, start, end)
+        ).fetchall()
+
+        tasks = []
+        with self.conn:
+            for path, mtime_ns, size, open_tasks in rows:
+                tasks.extend(self._validated_tasks(path, kind, mtime_ns, size, open_tasks) or [])
+        return tasks
+
+    def carry_over_tasks(self, daily_folder, quick_folder, today):
+        """
+        Open tasks for a new daily note dated today. These are the previous
+        daily note's unchecked tasks, plus any from quick notes written since
+        that day. Duplicates are dropped.
+        """
+        self.refresh(daily_folder, 'daily')
+        self.refresh(quick_folder, 'quick')
+
+        previous = self.latest_before('daily', today)
+        if previous is None:
+            return []
+
+        previous_date, tasks = previous
+        tasks = tasks + self.open_tasks_between('quick', previous_date, today)
+
+        seen = set()
+        unique = []
+        for task in tasks:
+            key = task.strip()
+            if key not in seen:
+                seen.add(key)
+                unique.append(task)
+        return unique